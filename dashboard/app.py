@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import sys
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
-import psycopg
 import streamlit as st
+from psycopg_pool import ConnectionPool
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
@@ -14,7 +14,7 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from nba_analytics.config import Settings
-from nba_analytics import queries
+from nba_analytics import db, queries
 
 
 st.set_page_config(page_title="NBA Analytics", layout="wide")
@@ -36,9 +36,29 @@ if start_date > end_date:
     st.stop()
 
 
-@st.cache_data(ttl=60, show_spinner=False)
-def load_data(start_dt: date, end_dt: date) -> dict[str, pd.DataFrame]:
-    with psycopg.connect(settings.database_url) as conn:
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ConnectionPool:
+    return db.create_pool(settings.database_url, min_size=2, max_size=10)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_data_version() -> datetime | None:
+    with get_pool().connection() as conn:
+        return queries.latest_ingestion_at(conn)
+
+
+@st.cache_resource(show_spinner=False)
+def seen_data_version() -> dict[str, datetime | None]:
+    return {}
+
+
+# Keyed on the last successful ingestion so results are reused until new data
+# actually lands. Persisted to disk so a restarted app starts warm; Streamlit
+# ignores TTL and max_entries on disk, so entries for superseded versions are
+# dropped below whenever the data version moves.
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False)
+def load_data(start_dt: date, end_dt: date, data_version: datetime | None) -> dict[str, pd.DataFrame]:
+    with get_pool().connection() as conn:
         return {
             "accuracy": queries.accuracy_trend(conn, start_dt, end_dt),
             "dfs": queries.dfs_trend(conn, start_dt, end_dt),
@@ -48,9 +68,16 @@ def load_data(start_dt: date, end_dt: date) -> dict[str, pd.DataFrame]:
 
 
 if refresh:
+    load_data_version.clear()
+    load_data.clear()
+
+data_version = load_data_version()
+seen = seen_data_version()
+if "version" in seen and seen["version"] != data_version:
     load_data.clear()
+seen["version"] = data_version
 
-data = load_data(start_date, end_date)
+data = load_data(start_date, end_date, data_version)
 accuracy_df = data["accuracy"]
 dfs_df = data["dfs"]
 misses_df = data["misses"]
@@ -1,3 +1,9 @@
+CREATE TABLE IF NOT EXISTS schema_meta (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    version INTEGER NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 CREATE TABLE IF NOT EXISTS ingestion_runs (
     run_id BIGSERIAL PRIMARY KEY,
     started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -13,13 +19,15 @@ CREATE TABLE IF NOT EXISTS raw_endpoint_snapshot (
     snapshot_date DATE,
     payload JSONB NOT NULL,
     retrieved_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-    payload_hash TEXT NOT NULL
+    payload_hash BYTEA NOT NULL
 );
 CREATE UNIQUE INDEX IF NOT EXISTS ux_raw_endpoint_snapshot
     ON raw_endpoint_snapshot (endpoint, snapshot_date, payload_hash);
+CREATE INDEX IF NOT EXISTS ix_raw_endpoint_snapshot_latest
+    ON raw_endpoint_snapshot (endpoint, snapshot_date, retrieved_at DESC);
 
 CREATE TABLE IF NOT EXISTS prediction_daily (
-    row_key TEXT PRIMARY KEY,
+    row_key BYTEA PRIMARY KEY,
     game_date DATE NOT NULL,
     player_name TEXT,
     team TEXT,
@@ -51,7 +59,7 @@ CREATE TABLE IF NOT EXISTS dfs_slate_daily (
 );
 
 CREATE TABLE IF NOT EXISTS dfs_projection_daily (
-    row_key TEXT PRIMARY KEY,
+    row_key BYTEA PRIMARY KEY,
     slate_date DATE NOT NULL,
     player_name TEXT,
     team TEXT,
@@ -63,15 +71,22 @@ CREATE TABLE IF NOT EXISTS dfs_projection_daily (
 );
 
 CREATE TABLE IF NOT EXISTS backtest_top3_daily (
-    row_key TEXT PRIMARY KEY,
+    row_key BYTEA PRIMARY KEY,
     slate_date DATE,
     strategy TEXT,
     payload JSONB NOT NULL,
     ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+CREATE MATERIALIZED VIEW IF NOT EXISTS backtest_top3_daily_counts AS
+    SELECT slate_date, COUNT(*) AS top3_rows
+    FROM backtest_top3_daily
+    WHERE slate_date IS NOT NULL
+    GROUP BY slate_date;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_backtest_top3_daily_counts ON backtest_top3_daily_counts (slate_date);
+
 CREATE TABLE IF NOT EXISTS backtest_portfolio_daily (
-    row_key TEXT PRIMARY KEY,
+    row_key BYTEA PRIMARY KEY,
     slate_date DATE,
     strategy TEXT,
     payload JSONB NOT NULL,
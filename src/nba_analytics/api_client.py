@@ -1,63 +1,102 @@
 from __future__ import annotations
 
-import time
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
+from urllib.parse import parse_qsl, urlsplit
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Largest page the source API will serve; bigger requests are clamped.
+MAX_PAGE_SIZE = 1000
+# Pages fetched in parallel by one paginated call.
+DEFAULT_PAGE_CONCURRENCY = 8
+
+logger = logging.getLogger(__name__)
 
 
 class ApiClientError(RuntimeError):
     """Raised for API request failures."""
 
 
+class PaginationLimitError(ApiClientError):
+    """Raised when a paginated result has more pages than ``max_pages`` allows."""
+
+
 @dataclass
 class NbaDailyApiClient:
     base_url: str
     timeout_seconds: int = 20
     max_retries: int = 3
     retry_backoff_seconds: float = 0.75
+    # Keep-alive connections per host; size to the number of concurrent requests.
+    pool_maxsize: int = 32
 
     def __post_init__(self) -> None:
         self.session = requests.Session()
+        self.session.headers["Accept"] = "application/json"
+        retry = Retry(
+            total=max(self.max_retries - 1, 0),
+            backoff_factor=self.retry_backoff_seconds,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def close(self) -> None:
         self.session.close()
 
+    def __enter__(self) -> NbaDailyApiClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def _url(self, path: str) -> str:
         return f"{self.base_url}/{path.lstrip('/')}"
 
     def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
-        last_error: Exception | None = None
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                response = self.session.get(self._url(path), params=params, timeout=self.timeout_seconds)
-                if response.status_code >= 400:
-                    detail = response.text[:500]
-                    raise ApiClientError(f"GET {path} failed ({response.status_code}): {detail}")
-                return response.json()
-            except (requests.RequestException, ValueError, ApiClientError) as exc:
-                last_error = exc
-                if attempt == self.max_retries:
-                    break
-                time.sleep(self.retry_backoff_seconds * attempt)
-
-        raise ApiClientError(f"GET {path} failed after retries: {last_error}")
+        # Connection errors and transient statuses are retried by the mounted
+        # adapter; anything that still fails here is final.
+        try:
+            response = self.session.get(self._url(path), params=params, timeout=self.timeout_seconds)
+        except requests.RequestException as exc:
+            raise ApiClientError(f"GET {path} failed after retries: {exc}") from exc
+        if response.status_code >= 400:
+            detail = response.text[:500]
+            raise ApiClientError(f"GET {path} failed ({response.status_code}): {detail}")
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
+            raise ApiClientError(f"GET {path} returned invalid JSON: {exc}") from exc
 
     @staticmethod
     def records(payload: Any) -> list[dict[str, Any]]:
-        if isinstance(payload, dict) and isinstance(payload.get("data"), list):
-            return [x for x in payload["data"] if isinstance(x, dict)]
-        if isinstance(payload, list):
-            return [x for x in payload if isinstance(x, dict)]
+        # {"data": [...]} is by far the most common shape, so test it first
+        # with a single type check and lookup.
         if isinstance(payload, dict):
+            data = payload.get("data")
+            if isinstance(data, list):
+                return [x for x in data if isinstance(x, dict)]
             return [payload]
+        if isinstance(payload, list):
+            return [x for x in payload if isinstance(x, dict)]
         return []
 
     @staticmethod
     def date_values(payload: Any) -> list[str]:
-        if isinstance(payload, dict) and isinstance(payload.get("data"), list):
-            return [str(x) for x in payload["data"]]
+        if isinstance(payload, dict):
+            data = payload.get("data")
+            return [str(x) for x in data] if isinstance(data, list) else []
         if isinstance(payload, list):
             return [str(x) for x in payload]
         return []
@@ -68,28 +107,113 @@ class NbaDailyApiClient:
         params: dict[str, Any] | None = None,
         page_size: int = 500,
         max_pages: int = 500,
+        max_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
     ) -> list[dict[str, Any]]:
-        all_rows: list[dict[str, Any]] = []
+        return list(self.iter_records(path, params, page_size, max_pages, max_concurrency))
+
+    def iter_records(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        page_size: int = 500,
+        max_pages: int = 500,
+        max_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield rows page by page instead of materialising the full result.
+
+        Prefer this over paginated_records() when rows can be consumed as they
+        arrive. Pages are fetched at most max_concurrency ahead of the consumer,
+        so memory stays bounded by that window.
+        """
         params = dict(params or {})
         offset = int(params.pop("offset", 0))
-        limit = int(params.pop("limit", page_size))
+        limit = min(int(params.pop("limit", page_size)), MAX_PAGE_SIZE)
+        calls = 0
+        total_rows = 0
+
+        def fetch_page(page_offset: int) -> list[dict[str, Any]]:
+            return self.records(self.get(path, {**params, "offset": page_offset, "limit": limit}))
 
         for _ in range(max_pages):
             page_params = {**params, "offset": offset, "limit": limit}
             payload = self.get(path, page_params)
+            calls += 1
             rows = self.records(payload)
             if not rows:
                 break
-            all_rows.extend(rows)
+            total_rows += len(rows)
+            yield from rows
+
+            # Cursor pages cost the server O(page_size) rather than O(offset),
+            # so follow them whenever the first response offers one.
+            next_params = self._next_page_params(payload)
+            if calls == 1 and next_params is not None:
+                while next_params is not None:
+                    if calls >= max_pages:
+                        raise PaginationLimitError(f"GET {path} has more than max_pages={max_pages} pages")
+                    payload = self.get(path, {**params, "limit": limit, **next_params})
+                    calls += 1
+                    rows = self.records(payload)
+                    if not rows:
+                        break
+                    total_rows += len(rows)
+                    yield from rows
+                    following = self._next_page_params(payload)
+                    # A cursor that doesn't advance would re-request this page forever.
+                    next_params = following if following != next_params else None
+                break
 
-            if isinstance(payload, dict) and isinstance(payload.get("count"), int):
-                if offset + len(rows) >= payload["count"]:
+            count = payload.get("count") if isinstance(payload, dict) else None
+            if isinstance(count, int):
+                if offset + len(rows) >= count:
+                    break
+                # The total is known, so the remaining offsets are fetched in
+                # parallel through a sliding window that yields in page order.
+                offsets = range(offset + limit, count, limit)
+                if calls == 1 and len(offsets) > max_pages - 1:
+                    raise PaginationLimitError(f"GET {path} has {count} rows, more than max_pages={max_pages} pages")
+                if calls == 1 and len(rows) == limit and max_concurrency > 1 and offsets:
+                    workers = min(max_concurrency, len(offsets))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        pending: deque[Future[list[dict[str, Any]]]] = deque()
+                        for page_offset in offsets:
+                            pending.append(executor.submit(fetch_page, page_offset))
+                            if len(pending) < workers:
+                                continue
+                            page = pending.popleft().result()
+                            total_rows += len(page)
+                            yield from page
+                        while pending:
+                            page = pending.popleft().result()
+                            total_rows += len(page)
+                            yield from page
+                    calls += len(offsets)
                     break
             if len(rows) < limit:
                 break
             offset += len(rows)
+        else:
+            # Every allowed page came back full, so rows past the limit would be
+            # silently dropped; callers treat results as complete.
+            raise PaginationLimitError(f"GET {path} has more than max_pages={max_pages} pages")
+
+        logger.debug("GET %s: calls=%d rows=%d page_size=%d", path, calls, total_rows, limit)
 
-        return all_rows
+    @staticmethod
+    def _next_page_params(payload: Any) -> dict[str, Any] | None:
+        if not isinstance(payload, dict):
+            return None
+        meta = payload.get("meta")
+        if isinstance(meta, dict) and meta.get("next_cursor"):
+            return {"cursor": meta["next_cursor"]}
+        links = payload.get("links")
+        if isinstance(links, dict) and links.get("next"):
+            next_params = dict(parse_qsl(urlsplit(str(links["next"])).query))
+            # Offset-style next links are better served by the parallel offset path,
+            # and a link without a query carries no cursor to follow.
+            if next_params and "offset" not in next_params:
+                return next_params
+        return None
 
     def fetch_prediction_dates(self) -> list[str]:
         return self.date_values(self.get("/dates/predictions"))
@@ -102,5 +226,5 @@ class NbaDailyApiClient:
 
     @staticmethod
     def sorted_dates(values: Iterable[str]) -> list[str]:
-        return sorted(set(v for v in values if v))
+        return sorted({v for v in values if v})
 
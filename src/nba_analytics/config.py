@@ -14,6 +14,7 @@ class Settings:
     database_url: str
     ingestion_default_lookback_days: int
     ingestion_max_page_size: int
+    ingestion_max_workers: int
 
     @staticmethod
     def from_env() -> "Settings":
@@ -29,5 +30,6 @@ class Settings:
             database_url=database_url,
             ingestion_default_lookback_days=int(os.getenv("INGESTION_DEFAULT_LOOKBACK_DAYS", "45")),
             ingestion_max_page_size=int(os.getenv("INGESTION_MAX_PAGE_SIZE", "1000")),
+            ingestion_max_workers=int(os.getenv("INGESTION_MAX_WORKERS", "8")),
         )
 
@@ -1,20 +1,57 @@
 from __future__ import annotations
 
-import hashlib
-import json
+import atexit
 from datetime import date
 from typing import Any
 
+import orjson
 import psycopg
+from blake3 import blake3
 from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+# Bump whenever initialize_schema() gains new DDL so existing databases pick it up.
+SCHEMA_VERSION = 3
+
+# Prepare statements on their second execution; each upsert runs once per
+# date/slate, so the plan is reused across the rest of the batch loop.
+PREPARE_THRESHOLD = 1
+
+_pools: dict[str, ConnectionPool] = {}
+_schema_checked: dict[str, int] = {}
 
 
 def connect(database_url: str) -> psycopg.Connection:
-    return psycopg.connect(database_url)
+    return psycopg.connect(database_url, prepare_threshold=PREPARE_THRESHOLD)
+
+
+def create_pool(database_url: str, min_size: int = 1, max_size: int = 4) -> ConnectionPool:
+    return ConnectionPool(
+        database_url,
+        min_size=min_size,
+        max_size=max_size,
+        kwargs={"autocommit": False, "prepare_threshold": PREPARE_THRESHOLD},
+        open=True,
+    )
+
+
+def get_pool(database_url: str) -> ConnectionPool:
+    """Return the process-wide pool for ``database_url``, creating it on first use."""
+    pool = _pools.get(database_url)
+    if pool is None:
+        pool = _pools[database_url] = create_pool(database_url)
+        atexit.register(pool.close)
+    return pool
 
 
 def initialize_schema(conn: psycopg.Connection) -> None:
     schema_sql = """
+    CREATE TABLE IF NOT EXISTS schema_meta (
+        singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+        version INTEGER NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    );
+
     CREATE TABLE IF NOT EXISTS ingestion_runs (
         run_id BIGSERIAL PRIMARY KEY,
         started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -30,13 +67,15 @@ def initialize_schema(conn: psycopg.Connection) -> None:
         snapshot_date DATE,
         payload JSONB NOT NULL,
         retrieved_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-        payload_hash TEXT NOT NULL
+        payload_hash BYTEA NOT NULL
     );
     CREATE UNIQUE INDEX IF NOT EXISTS ux_raw_endpoint_snapshot
         ON raw_endpoint_snapshot (endpoint, snapshot_date, payload_hash);
+    CREATE INDEX IF NOT EXISTS ix_raw_endpoint_snapshot_latest
+        ON raw_endpoint_snapshot (endpoint, snapshot_date, retrieved_at DESC);
 
     CREATE TABLE IF NOT EXISTS prediction_daily (
-        row_key TEXT PRIMARY KEY,
+        row_key BYTEA PRIMARY KEY,
         game_date DATE NOT NULL,
         player_name TEXT,
         team TEXT,
@@ -70,7 +109,7 @@ def initialize_schema(conn: psycopg.Connection) -> None:
     );
 
     CREATE TABLE IF NOT EXISTS dfs_projection_daily (
-        row_key TEXT PRIMARY KEY,
+        row_key BYTEA PRIMARY KEY,
         slate_date DATE NOT NULL,
         player_name TEXT,
         team TEXT,
@@ -83,7 +122,7 @@ def initialize_schema(conn: psycopg.Connection) -> None:
     CREATE INDEX IF NOT EXISTS ix_dfs_projection_daily_slate_date ON dfs_projection_daily (slate_date);
 
     CREATE TABLE IF NOT EXISTS backtest_top3_daily (
-        row_key TEXT PRIMARY KEY,
+        row_key BYTEA PRIMARY KEY,
         slate_date DATE,
         strategy TEXT,
         payload JSONB NOT NULL,
@@ -91,20 +130,87 @@ def initialize_schema(conn: psycopg.Connection) -> None:
     );
     CREATE INDEX IF NOT EXISTS ix_backtest_top3_daily_slate_date ON backtest_top3_daily (slate_date);
 
+    CREATE MATERIALIZED VIEW IF NOT EXISTS backtest_top3_daily_counts AS
+        SELECT slate_date, COUNT(*) AS top3_rows
+        FROM backtest_top3_daily
+        WHERE slate_date IS NOT NULL
+        GROUP BY slate_date;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_backtest_top3_daily_counts ON backtest_top3_daily_counts (slate_date);
+
     CREATE TABLE IF NOT EXISTS backtest_portfolio_daily (
-        row_key TEXT PRIMARY KEY,
+        row_key BYTEA PRIMARY KEY,
         slate_date DATE,
         strategy TEXT,
         payload JSONB NOT NULL,
         ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
     );
     CREATE INDEX IF NOT EXISTS ix_backtest_portfolio_daily_slate_date ON backtest_portfolio_daily (slate_date);
+
+    -- Hash columns used to hold hex text; convert them in place to raw digests.
+    -- Rows keyed by the old SHA-256 scheme are replaced the next time their date
+    -- is ingested: the upserts prune keys missing from each date's new batch.
+    DO $$
+    DECLARE
+        target record;
+    BEGIN
+        FOR target IN
+            SELECT table_name::text AS table_name, column_name::text AS column_name
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND data_type = 'text'
+              AND (table_name::text, column_name::text) IN (
+                  ('raw_endpoint_snapshot', 'payload_hash'),
+                  ('prediction_daily', 'row_key'),
+                  ('dfs_projection_daily', 'row_key'),
+                  ('backtest_top3_daily', 'row_key'),
+                  ('backtest_portfolio_daily', 'row_key')
+              )
+        LOOP
+            EXECUTE format(
+                'ALTER TABLE %I ALTER COLUMN %I TYPE BYTEA USING decode(%I, ''hex'')',
+                target.table_name,
+                target.column_name,
+                target.column_name
+            );
+        END LOOP;
+    END $$;
     """
     with conn.cursor() as cur:
         cur.execute(schema_sql)
+        cur.execute(
+            """
+            INSERT INTO schema_meta (version) VALUES (%s)
+            ON CONFLICT (singleton) DO UPDATE SET version = EXCLUDED.version, updated_at = NOW()
+            """,
+            (SCHEMA_VERSION,),
+        )
     conn.commit()
 
 
+def schema_version(conn: psycopg.Connection) -> int | None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('schema_meta') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return None
+        cur.execute("SELECT version FROM schema_meta")
+        row = cur.fetchone()
+    return int(row[0]) if row else None
+
+
+def ensure_schema(conn: psycopg.Connection, database_url: str) -> None:
+    """Run ``initialize_schema`` only when the database is behind ``SCHEMA_VERSION``.
+
+    The outcome is remembered per DSN, so repeated ingests in one process skip
+    the catalog check as well.
+    """
+    if _schema_checked.get(database_url) == SCHEMA_VERSION:
+        return
+    current = schema_version(conn)
+    if current is None or current < SCHEMA_VERSION:
+        initialize_schema(conn)
+    _schema_checked[database_url] = SCHEMA_VERSION
+
+
 def begin_run(conn: psycopg.Connection) -> int:
     with conn.cursor() as cur:
         cur.execute("INSERT INTO ingestion_runs DEFAULT VALUES RETURNING run_id")
@@ -135,6 +241,12 @@ def finish_run(
     conn.commit()
 
 
+def refresh_backtest_counts(conn: psycopg.Connection) -> None:
+    # CONCURRENTLY keeps the view readable by the dashboard while it rebuilds.
+    with conn.cursor() as cur:
+        cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY backtest_top3_daily_counts")
+
+
 def to_float(value: Any) -> float | None:
     if value is None or value == "":
         return None
@@ -144,6 +256,15 @@ def to_float(value: Any) -> float | None:
         return None
 
 
+def _first_float(row: dict[str, Any], *keys: str) -> float | None:
+    """First value under ``keys`` that parses as a number; 0 counts, unparseable values fall through."""
+    for key in keys:
+        value = to_float(row.get(key))
+        if value is not None:
+            return value
+    return None
+
+
 def to_date(value: Any) -> date | None:
     if value is None:
         return None
@@ -158,9 +279,71 @@ def to_date(value: Any) -> date | None:
         return None
 
 
-def stable_hash(payload: Any) -> str:
-    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
-    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+def _canonical_json(payload: Any) -> bytes:
+    return orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+
+def stable_hash(payload: Any) -> bytes:
+    return blake3(_canonical_json(payload)).digest()
+
+
+def encode_rows(rows: list[dict[str, Any]]) -> list[bytes]:
+    """Canonical JSON for each row, to share between the snapshot and the upsert."""
+    return [_canonical_json(row) for row in rows]
+
+
+class PrefixedHasher:
+    """Computes ``stable_hash([prefix, *parts, row])`` from a row's canonical JSON.
+
+    The ``[prefix,`` bytes are serialized once; each digest hashes them joined
+    with the parts and the pre-encoded row in a single call, so keys stay
+    identical to the plain ``stable_hash`` form.
+    """
+
+    def __init__(self, prefix: Any) -> None:
+        self._prefix = b"[" + _canonical_json(prefix) + b","
+
+    def digest_encoded(self, parts: tuple[Any, ...], encoded: bytes) -> bytes:
+        """Same as ``stable_hash([prefix, *parts, value])`` where ``encoded`` is ``value``'s canonical JSON."""
+        return blake3(self._prefix + _canonical_json(list(parts))[1:-1] + b"," + encoded + b"]").digest()
+
+
+def _dumps_json(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=str)
+
+
+def _raw_json(serialized: bytes) -> bytes:
+    return serialized
+
+
+def _upsert_records(conn: psycopg.Connection, sql: str, records: dict[Any, dict[str, Any]]) -> int:
+    # The whole batch travels as one JSONB array that the statement shreds
+    # with jsonb_to_recordset(): one serialization, one bind, one round-trip.
+    # Records are keyed by their conflict target so a batch never touches the
+    # same row twice, which ON CONFLICT DO UPDATE rejects. Returns the number
+    # of rows actually written; unchanged rows are skipped by the statement.
+    if not records:
+        return 0
+    with conn.cursor(binary=True) as cur:
+        cur.execute(sql, (Jsonb(list(records.values()), dumps=_dumps_json),))
+        return cur.rowcount
+
+
+def _prune_replaced_rows(
+    conn: psycopg.Connection,
+    table_name: str,
+    date_column: str,
+    row_date: date,
+    row_keys: list[bytes],
+) -> None:
+    # A date's batch is its complete row set, so anything else stored under that
+    # date is stale: rows the API stopped returning, or rows keyed by an older
+    # hashing scheme that the incoming keys would otherwise duplicate.
+    with conn.cursor() as cur:
+        cur.execute(
+            f"DELETE FROM {table_name} WHERE {date_column} = %s AND row_key <> ALL(%s)",
+            (row_date, row_keys),
+        )
 
 
 def store_raw_snapshot(
@@ -168,56 +351,118 @@ def store_raw_snapshot(
     endpoint: str,
     snapshot_date: date | None,
     payload: Any,
-) -> None:
-    payload_hash = stable_hash(payload)
+    encoded_rows: list[bytes] | None = None,
+) -> bool:
+    """Record ``payload`` as the latest snapshot; return False when it matches the latest one.
+
+    Only the most recent snapshot for (endpoint, snapshot_date) counts, so data
+    that reverts to an earlier payload (A -> B -> A) is reported as changed.
+    When ``payload`` is a list of rows already passed through ``encode_rows``,
+    pass the result as ``encoded_rows`` to reuse it instead of serializing again.
+    """
+    if encoded_rows is not None:
+        serialized = b"[" + b",".join(encoded_rows) + b"]"
+    else:
+        serialized = _canonical_json(payload)
+    payload_hash = blake3(serialized).digest()
+    date_filter = "snapshot_date IS NULL" if snapshot_date is None else "snapshot_date = %s"
+    date_params = () if snapshot_date is None else (snapshot_date,)
     with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT payload_hash FROM raw_endpoint_snapshot
+            WHERE endpoint = %s AND {date_filter}
+            ORDER BY retrieved_at DESC
+            LIMIT 1
+            """,
+            (endpoint, *date_params),
+        )
+        latest = cur.fetchone()
+        if latest is not None and bytes(latest[0]) == payload_hash:
+            return False
+        # clock_timestamp() rather than NOW() so snapshots taken within one
+        # transaction still order correctly.
         cur.execute(
             """
-            INSERT INTO raw_endpoint_snapshot (endpoint, snapshot_date, payload, payload_hash)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (endpoint, snapshot_date, payload_hash) DO NOTHING
+            INSERT INTO raw_endpoint_snapshot (endpoint, snapshot_date, payload, payload_hash, retrieved_at)
+            VALUES (%s, %s, %s, %s, clock_timestamp())
+            ON CONFLICT (endpoint, snapshot_date, payload_hash) DO UPDATE SET retrieved_at = EXCLUDED.retrieved_at
             """,
-            (endpoint, snapshot_date, Jsonb(payload), payload_hash),
+            (endpoint, snapshot_date, Jsonb(serialized, dumps=_raw_json), payload_hash),
         )
+    return True
 
 
-def upsert_prediction_rows(conn: psycopg.Connection, game_date: date, rows: list[dict[str, Any]]) -> int:
-    inserted = 0
+def upsert_prediction_rows(
+    conn: psycopg.Connection,
+    game_date: date,
+    rows: list[dict[str, Any]],
+    encoded_rows: list[bytes] | None = None,
+) -> int:
     sql = """
         INSERT INTO prediction_daily (
             row_key, game_date, player_name, team, projected_ppg, actual_ppg, absolute_error, payload
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        SELECT decode(r.row_key, 'hex'), r.game_date, r.player_name, r.team,
+               r.projected_ppg, r.actual_ppg, r.absolute_error, r.payload
+        FROM jsonb_to_recordset(%s) AS r(
+            row_key TEXT,
+            game_date DATE,
+            player_name TEXT,
+            team TEXT,
+            projected_ppg DOUBLE PRECISION,
+            actual_ppg DOUBLE PRECISION,
+            absolute_error DOUBLE PRECISION,
+            payload JSONB
+        )
         ON CONFLICT (row_key) DO UPDATE SET
             projected_ppg = EXCLUDED.projected_ppg,
             actual_ppg = EXCLUDED.actual_ppg,
             absolute_error = EXCLUDED.absolute_error,
             payload = EXCLUDED.payload,
             ingested_at = NOW()
+        WHERE prediction_daily.payload IS DISTINCT FROM EXCLUDED.payload
     """
-    with conn.cursor() as cur:
-        for row in rows:
-            player_name = (row.get("player_name") or row.get("name") or "").strip() or None
-            team = (row.get("team") or row.get("team_name") or "").strip() or None
-            projected = to_float(row.get("projected_ppg") or row.get("projection_ppg") or row.get("projected_points"))
-            actual = to_float(row.get("actual_ppg") or row.get("actual_points"))
-            abs_error = abs(actual - projected) if actual is not None and projected is not None else None
-            row_key = stable_hash([game_date.isoformat(), player_name, team, row])
-            cur.execute(
-                sql,
-                (row_key, game_date, player_name, team, projected, actual, abs_error, Jsonb(row)),
-            )
-            inserted += 1
-    return inserted
+    hasher = PrefixedHasher(game_date.isoformat())
+    records: dict[bytes, dict[str, Any]] = {}
+    if encoded_rows is None:
+        encoded_rows = encode_rows(rows)
+    for row, encoded in zip(rows, encoded_rows):
+        player_name = (row.get("player_name") or row.get("name") or "").strip() or None
+        team = (row.get("team") or row.get("team_name") or "").strip() or None
+        projected = _first_float(row, "projected_ppg", "projection_ppg", "projected_points")
+        actual = _first_float(row, "actual_ppg", "actual_points")
+        abs_error = abs(actual - projected) if actual is not None and projected is not None else None
+        row_key = hasher.digest_encoded((player_name, team), encoded)
+        records[row_key] = {
+            "row_key": row_key.hex(),
+            "game_date": game_date,
+            "player_name": player_name,
+            "team": team,
+            "projected_ppg": projected,
+            "actual_ppg": actual,
+            "absolute_error": abs_error,
+            "payload": orjson.Fragment(encoded),
+        }
+    if records:
+        _prune_replaced_rows(conn, "prediction_daily", "game_date", game_date, list(records))
+    return _upsert_records(conn, sql, records)
 
 
 def upsert_accuracy_rows(conn: psycopg.Connection, rows: list[dict[str, Any]]) -> int:
-    inserted = 0
     sql = """
         INSERT INTO accuracy_daily (
             game_date, mean_absolute_error, rmse, hit_rate_floor_ceiling, mean_error, payload
         )
-        VALUES (%s, %s, %s, %s, %s, %s)
+        SELECT r.game_date, r.mean_absolute_error, r.rmse, r.hit_rate_floor_ceiling, r.mean_error, r.payload
+        FROM jsonb_to_recordset(%s) AS r(
+            game_date DATE,
+            mean_absolute_error DOUBLE PRECISION,
+            rmse DOUBLE PRECISION,
+            hit_rate_floor_ceiling DOUBLE PRECISION,
+            mean_error DOUBLE PRECISION,
+            payload JSONB
+        )
         ON CONFLICT (game_date) DO UPDATE SET
             mean_absolute_error = EXCLUDED.mean_absolute_error,
             rmse = EXCLUDED.rmse,
@@ -225,25 +470,22 @@ def upsert_accuracy_rows(conn: psycopg.Connection, rows: list[dict[str, Any]]) -
             mean_error = EXCLUDED.mean_error,
             payload = EXCLUDED.payload,
             ingested_at = NOW()
+        WHERE accuracy_daily.payload IS DISTINCT FROM EXCLUDED.payload
     """
-    with conn.cursor() as cur:
-        for row in rows:
-            game_date = to_date(row.get("game_date") or row.get("date"))
-            if game_date is None:
-                continue
-            cur.execute(
-                sql,
-                (
-                    game_date,
-                    to_float(row.get("mean_absolute_error") or row.get("mae")),
-                    to_float(row.get("rmse")),
-                    to_float(row.get("hit_rate_floor_ceiling") or row.get("hit_rate")),
-                    to_float(row.get("mean_error")),
-                    Jsonb(row),
-                ),
-            )
-            inserted += 1
-    return inserted
+    records: dict[date, dict[str, Any]] = {}
+    for row in rows:
+        game_date = to_date(row.get("game_date") or row.get("date"))
+        if game_date is None:
+            continue
+        records[game_date] = {
+            "game_date": game_date,
+            "mean_absolute_error": to_float(row.get("mean_absolute_error") or row.get("mae")),
+            "rmse": to_float(row.get("rmse")),
+            "hit_rate_floor_ceiling": to_float(row.get("hit_rate_floor_ceiling") or row.get("hit_rate")),
+            "mean_error": to_float(row.get("mean_error")),
+            "payload": row,
+        }
+    return _upsert_records(conn, sql, records)
 
 
 def upsert_dfs_slate_row(conn: psycopg.Connection, slate_date: date, row: dict[str, Any]) -> int:
@@ -259,6 +501,7 @@ def upsert_dfs_slate_row(conn: psycopg.Connection, slate_date: date, row: dict[s
             value_correlation = EXCLUDED.value_correlation,
             payload = EXCLUDED.payload,
             ingested_at = NOW()
+        WHERE dfs_slate_daily.payload IS DISTINCT FROM EXCLUDED.payload
     """
     with conn.cursor() as cur:
         cur.execute(
@@ -272,62 +515,101 @@ def upsert_dfs_slate_row(conn: psycopg.Connection, slate_date: date, row: dict[s
                 Jsonb(row),
             ),
         )
-    return 1
+        return cur.rowcount
 
 
-def upsert_dfs_projection_rows(conn: psycopg.Connection, slate_date: date, rows: list[dict[str, Any]]) -> int:
-    inserted = 0
+def upsert_dfs_projection_rows(
+    conn: psycopg.Connection,
+    slate_date: date,
+    rows: list[dict[str, Any]],
+    encoded_rows: list[bytes] | None = None,
+) -> int:
     sql = """
         INSERT INTO dfs_projection_daily (
             row_key, slate_date, player_name, team, proj_fpts, actual_fpts, absolute_error, payload
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        SELECT decode(r.row_key, 'hex'), r.slate_date, r.player_name, r.team,
+               r.proj_fpts, r.actual_fpts, r.absolute_error, r.payload
+        FROM jsonb_to_recordset(%s) AS r(
+            row_key TEXT,
+            slate_date DATE,
+            player_name TEXT,
+            team TEXT,
+            proj_fpts DOUBLE PRECISION,
+            actual_fpts DOUBLE PRECISION,
+            absolute_error DOUBLE PRECISION,
+            payload JSONB
+        )
         ON CONFLICT (row_key) DO UPDATE SET
             proj_fpts = EXCLUDED.proj_fpts,
             actual_fpts = EXCLUDED.actual_fpts,
             absolute_error = EXCLUDED.absolute_error,
             payload = EXCLUDED.payload,
             ingested_at = NOW()
+        WHERE dfs_projection_daily.payload IS DISTINCT FROM EXCLUDED.payload
     """
-    with conn.cursor() as cur:
-        for row in rows:
-            player_name = (row.get("player_name") or row.get("name") or "").strip() or None
-            team = (row.get("team") or row.get("team_name") or "").strip() or None
-            proj = to_float(row.get("proj_fpts") or row.get("projected_fpts"))
-            actual = to_float(row.get("actual_fpts"))
-            abs_error = abs(actual - proj) if actual is not None and proj is not None else None
-            row_key = stable_hash([slate_date.isoformat(), player_name, team, row])
-            cur.execute(
-                sql,
-                (row_key, slate_date, player_name, team, proj, actual, abs_error, Jsonb(row)),
-            )
-            inserted += 1
-    return inserted
+    hasher = PrefixedHasher(slate_date.isoformat())
+    records: dict[bytes, dict[str, Any]] = {}
+    if encoded_rows is None:
+        encoded_rows = encode_rows(rows)
+    for row, encoded in zip(rows, encoded_rows):
+        player_name = (row.get("player_name") or row.get("name") or "").strip() or None
+        team = (row.get("team") or row.get("team_name") or "").strip() or None
+        proj = _first_float(row, "proj_fpts", "projected_fpts")
+        actual = _first_float(row, "actual_fpts")
+        abs_error = abs(actual - proj) if actual is not None and proj is not None else None
+        row_key = hasher.digest_encoded((player_name, team), encoded)
+        records[row_key] = {
+            "row_key": row_key.hex(),
+            "slate_date": slate_date,
+            "player_name": player_name,
+            "team": team,
+            "proj_fpts": proj,
+            "actual_fpts": actual,
+            "absolute_error": abs_error,
+            "payload": orjson.Fragment(encoded),
+        }
+    if records:
+        _prune_replaced_rows(conn, "dfs_projection_daily", "slate_date", slate_date, list(records))
+    return _upsert_records(conn, sql, records)
 
 
 def upsert_backtest_rows(
     conn: psycopg.Connection,
     table_name: str,
     rows: list[dict[str, Any]],
+    encoded_rows: list[bytes] | None = None,
 ) -> int:
     if table_name not in {"backtest_top3_daily", "backtest_portfolio_daily"}:
         raise ValueError(f"Unsupported table: {table_name}")
 
-    inserted = 0
     sql = f"""
         INSERT INTO {table_name} (row_key, slate_date, strategy, payload)
-        VALUES (%s, %s, %s, %s)
+        SELECT decode(r.row_key, 'hex'), r.slate_date, r.strategy, r.payload
+        FROM jsonb_to_recordset(%s) AS r(row_key TEXT, slate_date DATE, strategy TEXT, payload JSONB)
         ON CONFLICT (row_key) DO UPDATE SET
             strategy = EXCLUDED.strategy,
             payload = EXCLUDED.payload,
             ingested_at = NOW()
+        WHERE {table_name}.payload IS DISTINCT FROM EXCLUDED.payload
     """
-    with conn.cursor() as cur:
-        for row in rows:
-            slate_date = to_date(row.get("slate_date") or row.get("date"))
-            strategy = (row.get("strategy") or row.get("strategy_name") or "").strip() or None
-            row_key = stable_hash([table_name, slate_date.isoformat() if slate_date else "", strategy, row])
-            cur.execute(sql, (row_key, slate_date, strategy, Jsonb(row)))
-            inserted += 1
-    return inserted
-
+    hasher = PrefixedHasher(table_name)
+    records: dict[bytes, dict[str, Any]] = {}
+    keys_by_date: dict[date, list[bytes]] = {}
+    if encoded_rows is None:
+        encoded_rows = encode_rows(rows)
+    for row, encoded in zip(rows, encoded_rows):
+        slate_date = to_date(row.get("slate_date") or row.get("date"))
+        strategy = (row.get("strategy") or row.get("strategy_name") or "").strip() or None
+        row_key = hasher.digest_encoded((slate_date.isoformat() if slate_date else "", strategy), encoded)
+        records[row_key] = {
+            "row_key": row_key.hex(),
+            "slate_date": slate_date,
+            "strategy": strategy,
+            "payload": orjson.Fragment(encoded),
+        }
+        if slate_date is not None:
+            keys_by_date.setdefault(slate_date, []).append(row_key)
+    for slate_date, row_keys in keys_by_date.items():
+        _prune_replaced_rows(conn, table_name, "slate_date", slate_date, row_keys)
+    return _upsert_records(conn, sql, records)
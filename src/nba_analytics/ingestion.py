@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import argparse
+import logging
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Any
 
-from nba_analytics.api_client import ApiClientError, NbaDailyApiClient
+from nba_analytics.api_client import (
+    DEFAULT_PAGE_CONCURRENCY,
+    ApiClientError,
+    NbaDailyApiClient,
+    PaginationLimitError,
+)
 from nba_analytics.config import Settings
 
+logger = logging.getLogger(__name__)
+
 
 def parse_iso_date(value: str | None) -> date | None:
     if not value:
@@ -15,27 +25,60 @@ def parse_iso_date(value: str | None) -> date | None:
     return date.fromisoformat(value)
 
 
+# Widest date span fetched by one /predictions range request.
+PREDICTION_RANGE_DAYS = 14
+
+# Both paths normalise every value in Python first, so NumPy only pays off once
+# its C sort beats sorting the de-duplicated strings: measured at roughly 1000
+# values (e.g. 200 values: 45 us bisect vs 61 us NumPy; 3000: 1.1 ms vs 0.9 ms).
+VECTORIZE_MIN_DATES = 1000
+
+
+def _iso_day(value: str) -> str:
+    # Other ISO forms date.fromisoformat() accepts (20260105, 2026-W02-1) would
+    # sort wrongly as strings, so they are rewritten as YYYY-MM-DD.
+    day = value[:10]
+    if len(day) == 10 and day[4] == "-" and day[7] == "-":
+        return day
+    return date.fromisoformat(day).isoformat()
+
+
 def filter_dates(
     date_values: list[str],
     start_date: date | None,
     end_date: date | None,
     lookback_days: int | None,
 ) -> list[date]:
-    parsed = sorted({date.fromisoformat(v[:10]) for v in date_values if v})
-    if not parsed:
-        return []
-
     if start_date is None and lookback_days is not None:
         start_date = date.today() - timedelta(days=lookback_days)
 
-    filtered: list[date] = []
-    for d in parsed:
-        if start_date and d < start_date:
-            continue
-        if end_date and d > end_date:
-            continue
-        filtered.append(d)
-    return filtered
+    if len(date_values) > VECTORIZE_MIN_DATES:
+        return _filter_dates_numpy(date_values, start_date, end_date)
+
+    # YYYY-MM-DD strings sort in date order, so de-duplication and the
+    # [start, end] window work on the strings and only kept values are parsed.
+    keys = sorted({_iso_day(v) for v in date_values if v})
+    lo = bisect_left(keys, start_date.isoformat()) if start_date else 0
+    hi = bisect_right(keys, end_date.isoformat()) if end_date else len(keys)
+    return [date.fromisoformat(k) for k in keys[lo:hi]]
+
+
+def _filter_dates_numpy(
+    date_values: list[str],
+    start_date: date | None,
+    end_date: date | None,
+) -> list[date]:
+    import numpy as np
+
+    # np.unique sorts and de-duplicates in C; tolist() turns datetime64[D]
+    # back into datetime.date.
+    parsed = np.unique(np.array([_iso_day(v) for v in date_values if v], dtype="datetime64[D]"))
+    mask = np.ones(parsed.shape, dtype=bool)
+    if start_date:
+        mask &= parsed >= np.datetime64(start_date, "D")
+    if end_date:
+        mask &= parsed <= np.datetime64(end_date, "D")
+    return parsed[mask].tolist()
 
 
 @dataclass
@@ -67,6 +110,74 @@ def _get_or_none(client: NbaDailyApiClient, path: str, params: dict[str, Any] |
         raise
 
 
+def fetch_predictions(client: NbaDailyApiClient, game_date: date, page_size: int) -> list[dict[str, Any]]:
+    return client.paginated_records("/predictions", {"date": game_date.isoformat()}, page_size=page_size)
+
+
+def fetch_predictions_by_date(
+    client: NbaDailyApiClient,
+    dates: list[date],
+    page_size: int,
+    executor: Executor,
+) -> dict[date, list[dict[str, Any]]]:
+    # Paginated range requests instead of one per date, regrouped on the rows'
+    # own game date. Windows are capped at PREDICTION_RANGE_DAYS so a long
+    # backfill never runs into the client's page limit.
+    grouped: dict[date, list[dict[str, Any]]] = {}
+    window: list[date] = []
+    for game_date in dates:
+        if window and (game_date - window[0]).days >= PREDICTION_RANGE_DAYS:
+            grouped.update(_fetch_prediction_window(client, window, page_size, executor))
+            window = []
+        window.append(game_date)
+    if window:
+        grouped.update(_fetch_prediction_window(client, window, page_size, executor))
+    return grouped
+
+
+def _fetch_prediction_window(
+    client: NbaDailyApiClient,
+    dates: list[date],
+    page_size: int,
+    executor: Executor,
+) -> dict[date, list[dict[str, Any]]]:
+    # Each date's batch is treated as its complete row set (stale rows are
+    # pruned), so anything short of a full attribution falls back to the
+    # per-date endpoint rather than guess.
+    from nba_analytics import db
+
+    params = {"start_date": dates[0].isoformat(), "end_date": dates[-1].isoformat()}
+    try:
+        rows = client.paginated_records("/predictions", params, page_size=page_size)
+    except PaginationLimitError as exc:
+        logger.warning("%s; refetching %d dates one by one", exc, len(dates))
+        return _fetch_predictions_per_date(client, dates, page_size, executor)
+    grouped: dict[date, list[dict[str, Any]]] = {d: [] for d in dates}
+    for row in rows:
+        raw_date = row.get("game_date") or row.get("date")
+        row_date = db.to_date(raw_date)
+        if row_date not in grouped:
+            logger.warning(
+                "Prediction range %s..%s returned a row dated %r; refetching %d dates one by one",
+                params["start_date"],
+                params["end_date"],
+                raw_date,
+                len(dates),
+            )
+            return _fetch_predictions_per_date(client, dates, page_size, executor)
+        grouped[row_date].append(row)
+    return grouped
+
+
+def _fetch_predictions_per_date(
+    client: NbaDailyApiClient,
+    dates: list[date],
+    page_size: int,
+    executor: Executor,
+) -> dict[date, list[dict[str, Any]]]:
+    return dict(zip(dates, executor.map(lambda d: fetch_predictions(client, d, page_size), dates)))
+
+
 def run_ingestion(
     settings: Settings,
     start_date: date | None = None,
@@ -83,22 +194,47 @@ def run_ingestion(
     client = NbaDailyApiClient(
         base_url=settings.source_api_base_url,
         timeout_seconds=settings.source_api_timeout_seconds,
+        # Every ingestion worker can have a full paginated fan-out in flight.
+        pool_maxsize=settings.ingestion_max_workers * DEFAULT_PAGE_CONCURRENCY,
     )
 
+    # Snapshots double as change detection: when a payload matches the latest
+    # snapshot for its endpoint and date, its rows are already current and are skipped.
+    # HTTP fetches are independent and I/O bound, so they fan out over a thread
+    # pool; every database write stays on the single ingestion connection.
+    def fetch_slate(slate_date: date) -> tuple[Any | None, list[dict[str, Any]]]:
+        return (
+            _get_or_none(client, f"/dfs/slate-results/{slate_date.isoformat()}"),
+            client.paginated_records(f"/dfs/projections/{slate_date.isoformat()}", page_size=page_size),
+        )
+
+    def fetch_backtests(bt_date: date) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        params = {"start_date": bt_date.isoformat(), "end_date": bt_date.isoformat()}
+        return (
+            client.paginated_records("/backtest/top3", params=params, page_size=page_size),
+            client.paginated_records("/backtest/portfolio", params=params, page_size=page_size),
+        )
+
     run_id: int | None = None
-    conn = db.connect(settings.database_url)
+    pool = db.get_pool(settings.database_url)
+    conn = pool.getconn()
+    executor = ThreadPoolExecutor(max_workers=settings.ingestion_max_workers)
     try:
-        db.initialize_schema(conn)
+        db.ensure_schema(conn, settings.database_url)
         run_id = db.begin_run(conn)
 
-        prediction_dates = filter_dates(client.fetch_prediction_dates(), start_date, end_date, lookback_days)
-        dfs_dates = filter_dates(client.fetch_dfs_dates(), start_date, end_date, lookback_days)
-        backtest_dates = filter_dates(client.fetch_backtest_dates(), start_date, end_date, lookback_days)
+        prediction_values = executor.submit(client.fetch_prediction_dates)
+        dfs_values = executor.submit(client.fetch_dfs_dates)
+        backtest_values = executor.submit(client.fetch_backtest_dates)
+        prediction_dates = filter_dates(prediction_values.result(), start_date, end_date, lookback_days)
+        dfs_dates = filter_dates(dfs_values.result(), start_date, end_date, lookback_days)
+        backtest_dates = filter_dates(backtest_values.result(), start_date, end_date, lookback_days)
 
-        for game_date in prediction_dates:
-            rows = client.paginated_records("/predictions", {"date": game_date.isoformat()}, page_size=page_size)
-            db.store_raw_snapshot(conn, "/predictions", game_date, rows)
-            stats.prediction_rows += db.upsert_prediction_rows(conn, game_date, rows)
+        predictions_by_date = fetch_predictions_by_date(client, prediction_dates, page_size, executor)
+        for game_date, rows in predictions_by_date.items():
+            encoded = db.encode_rows(rows)
+            if db.store_raw_snapshot(conn, "/predictions", game_date, rows, encoded):
+                stats.prediction_rows += db.upsert_prediction_rows(conn, game_date, rows, encoded)
 
         if prediction_dates:
             accuracy_payload = client.get(
@@ -106,31 +242,35 @@ def run_ingestion(
                 {"start_date": prediction_dates[0].isoformat(), "end_date": prediction_dates[-1].isoformat()},
             )
             accuracy_rows = client.records(accuracy_payload)
-            db.store_raw_snapshot(conn, "/accuracy/daily-summary", None, accuracy_payload)
-            stats.accuracy_rows += db.upsert_accuracy_rows(conn, accuracy_rows)
+            if db.store_raw_snapshot(conn, "/accuracy/daily-summary", None, accuracy_payload):
+                stats.accuracy_rows += db.upsert_accuracy_rows(conn, accuracy_rows)
 
-        for slate_date in dfs_dates:
-            slate_payload = _get_or_none(client, f"/dfs/slate-results/{slate_date.isoformat()}")
-            if slate_payload:
-                db.store_raw_snapshot(conn, "/dfs/slate-results/{slate_date}", slate_date, slate_payload)
+        for slate_date, (slate_payload, projection_rows) in zip(dfs_dates, executor.map(fetch_slate, dfs_dates)):
+            if slate_payload and db.store_raw_snapshot(
+                conn, "/dfs/slate-results/{slate_date}", slate_date, slate_payload
+            ):
                 stats.dfs_slate_rows += db.upsert_dfs_slate_row(conn, slate_date, slate_payload)
 
-            projection_rows = client.paginated_records(
-                f"/dfs/projections/{slate_date.isoformat()}",
-                page_size=page_size,
-            )
-            db.store_raw_snapshot(conn, "/dfs/projections", slate_date, projection_rows)
-            stats.dfs_projection_rows += db.upsert_dfs_projection_rows(conn, slate_date, projection_rows)
+            encoded = db.encode_rows(projection_rows)
+            if db.store_raw_snapshot(conn, "/dfs/projections", slate_date, projection_rows, encoded):
+                stats.dfs_projection_rows += db.upsert_dfs_projection_rows(conn, slate_date, projection_rows, encoded)
+
+        top3_changed = False
+        for bt_date, (top3_rows, portfolio_rows) in zip(backtest_dates, executor.map(fetch_backtests, backtest_dates)):
+            encoded = db.encode_rows(top3_rows)
+            if db.store_raw_snapshot(conn, "/backtest/top3", bt_date, top3_rows, encoded):
+                # Pruned rows change the per-date counts even when nothing is inserted.
+                top3_changed = True
+                stats.backtest_top3_rows += db.upsert_backtest_rows(conn, "backtest_top3_daily", top3_rows, encoded)
 
-        for bt_date in backtest_dates:
-            params = {"start_date": bt_date.isoformat(), "end_date": bt_date.isoformat()}
-            top3_rows = client.paginated_records("/backtest/top3", params=params, page_size=page_size)
-            db.store_raw_snapshot(conn, "/backtest/top3", bt_date, top3_rows)
-            stats.backtest_top3_rows += db.upsert_backtest_rows(conn, "backtest_top3_daily", top3_rows)
+            encoded = db.encode_rows(portfolio_rows)
+            if db.store_raw_snapshot(conn, "/backtest/portfolio", bt_date, portfolio_rows, encoded):
+                stats.backtest_portfolio_rows += db.upsert_backtest_rows(
+                    conn, "backtest_portfolio_daily", portfolio_rows, encoded
+                )
 
-            portfolio_rows = client.paginated_records("/backtest/portfolio", params=params, page_size=page_size)
-            db.store_raw_snapshot(conn, "/backtest/portfolio", bt_date, portfolio_rows)
-            stats.backtest_portfolio_rows += db.upsert_backtest_rows(conn, "backtest_portfolio_daily", portfolio_rows)
+        if top3_changed:
+            db.refresh_backtest_counts(conn)
 
         conn.commit()
         db.finish_run(conn, run_id, "success", "Ingestion completed.", stats.as_dict())
@@ -141,8 +281,9 @@ def run_ingestion(
             db.finish_run(conn, run_id, "failed", str(exc), stats.as_dict())
         raise
     finally:
+        executor.shutdown(cancel_futures=True)
         client.close()
-        conn.close()
+        pool.putconn(conn)
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
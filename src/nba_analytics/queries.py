@@ -1,18 +1,62 @@
 from __future__ import annotations
 
-from datetime import date
+import uuid
+from datetime import date, datetime
 from typing import Any
 
 import pandas as pd
 import psycopg
+from psycopg.postgres import types as pg_types
 
+STREAM_CHUNK_SIZE = 10_000
 
-def _df(conn: psycopg.Connection, sql: str, params: tuple[Any, ...] = ()) -> pd.DataFrame:
-    with conn.cursor() as cur:
+_FLOAT_OIDS = frozenset(pg_types[name].oid for name in ("float4", "float8", "numeric"))
+
+
+def _frame(rows: list[tuple[Any, ...]], description: list[psycopg.Column] | None) -> pd.DataFrame:
+    # Type float columns from the result metadata instead of letting pandas
+    # infer them; a column holding any NULLs would otherwise fall back to
+    # object dtype (or stay object when every value is NULL).
+    columns = [desc.name for desc in description] if description else []
+    frame = pd.DataFrame(rows, columns=columns)
+    float_columns = {desc.name: "float64" for desc in description or [] if desc.type_code in _FLOAT_OIDS}
+    return frame.astype(float_columns) if float_columns else frame
+
+
+def _df(
+    conn: psycopg.Connection,
+    sql: str,
+    params: tuple[Any, ...] = (),
+    stream: bool = True,
+) -> pd.DataFrame:
+    if not stream:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return _frame(cur.fetchall(), cur.description)
+
+    # A named cursor keeps the result set on the server and hands it over in
+    # chunks, so only one chunk of tuples is alive client-side at a time.
+    chunks: list[pd.DataFrame] = []
+    with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cur:
         cur.execute(sql, params)
-        rows = cur.fetchall()
-        columns = [desc.name for desc in cur.description] if cur.description else []
-    return pd.DataFrame(rows, columns=columns)
+        description = cur.description
+        while rows := cur.fetchmany(STREAM_CHUNK_SIZE):
+            chunks.append(_frame(rows, description))
+            # A short chunk means the portal is drained; skip the empty FETCH.
+            if len(rows) < STREAM_CHUNK_SIZE:
+                break
+    if not chunks:
+        return _frame([], description)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+
+def latest_ingestion_at(conn: psycopg.Connection) -> datetime | None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT MAX(completed_at) FROM ingestion_runs WHERE status = 'success'")
+        row = cur.fetchone()
+    return row[0] if row else None
 
 
 def accuracy_trend(conn: psycopg.Connection, start_date: date, end_date: date) -> pd.DataFrame:
@@ -30,6 +74,7 @@ def accuracy_trend(conn: psycopg.Connection, start_date: date, end_date: date) -
         ORDER BY game_date
         """,
         (start_date, end_date),
+        stream=False,
     )
 
 
@@ -48,6 +93,7 @@ def dfs_trend(conn: psycopg.Connection, start_date: date, end_date: date) -> pd.
         ORDER BY slate_date
         """,
         (start_date, end_date),
+        stream=False,
     )
 
 
@@ -69,6 +115,7 @@ def top_prediction_misses(conn: psycopg.Connection, start_date: date, end_date:
         LIMIT %s
         """,
         (start_date, end_date, limit),
+        stream=False,
     )
 
 
@@ -78,12 +125,12 @@ def backtest_activity(conn: psycopg.Connection, start_date: date, end_date: date
         """
         SELECT
             slate_date,
-            COUNT(*) AS top3_rows
-        FROM backtest_top3_daily
+            top3_rows
+        FROM backtest_top3_daily_counts
         WHERE slate_date BETWEEN %s AND %s
-        GROUP BY slate_date
         ORDER BY slate_date
         """,
         (start_date, end_date),
+        stream=False,
     )
 
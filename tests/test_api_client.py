@@ -1,4 +1,37 @@
-from nba_analytics.api_client import NbaDailyApiClient
+import time
+
+import pytest
+
+from nba_analytics.api_client import MAX_PAGE_SIZE, NbaDailyApiClient, PaginationLimitError
+
+
+class StubClient(NbaDailyApiClient):
+    """Answers every GET with ``respond(params)`` and records the params sent."""
+
+    def __init__(self, respond) -> None:
+        super().__init__(base_url="http://example")
+        self.respond = respond
+        self.requests: list[dict] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    def get(self, path, params=None):
+        self.requests.append(params)
+        return self.respond(params)
+
+
+def counted_pages(total: int, delay=None):
+    """Offset pages over rows ``{"x": 0}`` .. ``{"x": total - 1}``, each reporting ``count``."""
+
+    def respond(params):
+        offset, limit = params["offset"], params["limit"]
+        if delay is not None:
+            time.sleep(delay(offset))
+        return {"count": total, "data": [{"x": i} for i in range(offset, min(offset + limit, total))]}
+
+    return respond
 
 
 def test_records_parser_supports_multiple_shapes() -> None:
@@ -35,3 +68,114 @@ def test_paginated_records_accumulates_pages() -> None:
     assert rows == [{"x": 1}, {"x": 2}, {"x": 3}]
     assert client.calls == 2
 
+
+@pytest.mark.parametrize("page_size", [1, 2, 5, 250, MAX_PAGE_SIZE * 2])
+def test_paginated_records_page_sizes(page_size: int) -> None:
+    client = StubClient(counted_pages(7))
+    rows = client.paginated_records("/predictions", page_size=page_size)
+    assert rows == [{"x": i} for i in range(7)]
+    assert {params["limit"] for params in client.requests} == {min(page_size, MAX_PAGE_SIZE)}
+    assert client.calls == -(-7 // min(page_size, MAX_PAGE_SIZE))
+
+
+def test_paginated_records_keeps_page_order_when_fetched_concurrently() -> None:
+    # Earlier pages answer last, so completion order is reversed.
+    client = StubClient(counted_pages(10, delay=lambda offset: (10 - offset) * 0.005))
+    rows = client.paginated_records("/predictions", page_size=2, max_concurrency=4)
+    assert rows == [{"x": i} for i in range(10)]
+    assert sorted(params["offset"] for params in client.requests) == [0, 2, 4, 6, 8]
+
+
+def test_iter_records_fetches_pages_lazily() -> None:
+    pages = {0: [{"x": 1}, {"x": 2}], 2: [{"x": 3}]}
+    client = StubClient(lambda params: {"data": pages.get(params["offset"], [])})
+    rows = client.iter_records("/predictions", page_size=2)
+    assert client.calls == 0
+    assert next(rows) == {"x": 1}
+    assert client.calls == 1
+    assert list(rows) == [{"x": 2}, {"x": 3}]
+    assert client.calls == 2
+
+
+def test_iter_records_fetches_at_most_max_concurrency_pages_ahead() -> None:
+    client = StubClient(counted_pages(20))
+    consumed = 0
+    for row in client.iter_records("/predictions", page_size=1, max_concurrency=3):
+        consumed += 1
+        assert row == {"x": consumed - 1}
+        assert client.calls <= consumed + 3
+    assert consumed == 20
+
+
+@pytest.mark.parametrize("with_count", [True, False])
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_paginated_records_refuses_to_truncate_at_max_pages(with_count: bool, max_concurrency: int) -> None:
+    def respond(params):
+        page = counted_pages(10)(params)
+        return page if with_count else {"data": page["data"]}
+
+    client = StubClient(respond)
+    with pytest.raises(PaginationLimitError):
+        client.paginated_records("/predictions", page_size=2, max_pages=3, max_concurrency=max_concurrency)
+    rows = client.paginated_records("/predictions", page_size=2, max_pages=6, max_concurrency=max_concurrency)
+    assert rows == [{"x": i} for i in range(10)]
+
+
+@pytest.mark.parametrize(("count", "expected_calls"), [(4, 2), (None, 3)])
+def test_paginated_records_stops_on_count_without_empty_probe(count, expected_calls) -> None:
+    def respond(params):
+        page = counted_pages(4)(params)
+        return page if count is not None else {"data": page["data"]}
+
+    client = StubClient(respond)
+    rows = client.paginated_records("/predictions", page_size=2, max_concurrency=1)
+    assert rows == [{"x": i} for i in range(4)]
+    # Without a count the last full page can only be confirmed by an empty one.
+    assert client.calls == expected_calls
+
+
+def test_client_closes_session_on_exit(monkeypatch) -> None:
+    closed = []
+    with NbaDailyApiClient(base_url="http://example", pool_maxsize=4) as client:
+        assert client.session.get_adapter("https://example")._pool_maxsize == 4
+        monkeypatch.setattr(client.session, "close", lambda: closed.append(True))
+    assert closed == [True]
+
+
+@pytest.mark.parametrize(
+    ("first_page", "later_cursor", "expected_calls"),
+    [
+        ({"data": [{"x": 1}], "meta": {"next_cursor": "abc"}}, None, 2),
+        ({"data": [{"x": 1}], "links": {"next": "http://example/predictions?cursor=abc&limit=2"}}, None, 2),
+        # A server repeating the same cursor must not be followed again.
+        ({"data": [{"x": 1}], "meta": {"next_cursor": "abc"}}, "abc", 2),
+        # A next link without a query has no cursor; offset paging takes over.
+        ({"data": [{"x": 1}], "links": {"next": "http://example/predictions/page/2"}}, None, 1),
+    ],
+)
+def test_paginated_records_follows_cursor(first_page, later_cursor, expected_calls) -> None:
+    def respond(params):
+        if "cursor" not in params:
+            return first_page
+        return {"data": [{"x": 2}, {"x": 3}], "meta": {"next_cursor": later_cursor}}
+
+    client = StubClient(respond)
+    rows = client.paginated_records("/predictions", {"date": "2026-01-10"}, page_size=2, max_pages=5)
+    assert client.calls == expected_calls
+    if expected_calls == 1:
+        assert rows == [{"x": 1}]
+        return
+    assert rows == [{"x": 1}, {"x": 2}, {"x": 3}]
+    assert client.requests[1]["cursor"] == "abc"
+    assert client.requests[1]["date"] == "2026-01-10"
+    assert "offset" not in client.requests[1]
+
+def test_paginated_records_refuses_to_truncate_cursor_pages() -> None:
+    def respond(params):
+        page = int(params.get("cursor", 0))
+        return {"data": [{"x": page}], "meta": {"next_cursor": str(page + 1)}}
+
+    client = StubClient(respond)
+    with pytest.raises(PaginationLimitError):
+        client.paginated_records("/predictions", page_size=2, max_pages=3)
+    assert client.calls == 3
@@ -0,0 +1,124 @@
+from datetime import date
+
+from nba_analytics.db import (
+    PrefixedHasher,
+    _first_float,
+    encode_rows,
+    stable_hash,
+    store_raw_snapshot,
+    upsert_backtest_rows,
+    upsert_prediction_rows,
+)
+
+
+class FakeCursor:
+    def __init__(self, conn: "FakeConnection") -> None:
+        self.conn = conn
+        self.rowcount = 0
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def execute(self, sql: str, params=()) -> None:
+        sql = " ".join(sql.split())
+        self.conn.executed.append((sql, params))
+        self.result = None
+        # Just enough of raw_endpoint_snapshot to model "latest snapshot" lookups.
+        if sql.startswith("SELECT payload_hash FROM raw_endpoint_snapshot"):
+            snapshot_date = params[1] if len(params) > 1 else None
+            latest = self.conn.latest_snapshot.get((params[0], snapshot_date))
+            self.result = (latest,) if latest is not None else None
+        elif sql.startswith("INSERT INTO raw_endpoint_snapshot"):
+            endpoint, snapshot_date, _, payload_hash = params
+            self.conn.latest_snapshot[(endpoint, snapshot_date)] = payload_hash
+            self.rowcount = 1
+
+    def fetchone(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.executed: list[tuple[str, tuple]] = []
+        self.latest_snapshot: dict[tuple[str, date | None], bytes] = {}
+
+    def cursor(self, **kwargs) -> FakeCursor:
+        return FakeCursor(self)
+
+
+def test_stable_hash_ignores_key_order() -> None:
+    left = stable_hash([date(2026, 1, 10), {"a": 1, "b": [1, 2]}])
+    right = stable_hash(["2026-01-10", {"b": [1, 2], "a": 1}])
+    assert left == right
+    assert len(left) == 32
+    assert stable_hash({"a": 1}) != stable_hash({"a": 2})
+
+
+def test_encoded_rows_hash_like_plain_rows() -> None:
+    rows = [{"b": 1, "a": "x"}, {"a": None}]
+    encoded = encode_rows(rows)
+    hasher = PrefixedHasher("backtest_top3_daily")
+    assert hasher.digest_encoded(("2026-01-10", "s1"), encoded[0]) == stable_hash(
+        ["backtest_top3_daily", "2026-01-10", "s1", rows[0]]
+    )
+    assert PrefixedHasher("2026-01-10").digest_encoded(("A", None), encoded[1]) == stable_hash(
+        ["2026-01-10", "A", None, rows[1]]
+    )
+
+
+def test_upserts_prune_rows_missing_from_the_dates_batch() -> None:
+    conn = FakeConnection()
+    rows = [{"player_name": "A", "team": "BOS"}, {"player_name": "B", "team": "NYK"}]
+    upsert_prediction_rows(conn, date(2026, 1, 10), rows)
+    (delete_sql, delete_params), (insert_sql, insert_params) = conn.executed
+    assert delete_sql.startswith("DELETE FROM prediction_daily WHERE game_date = %s")
+    assert delete_params[0] == date(2026, 1, 10)
+    assert [key.hex() for key in delete_params[1]] == [r["row_key"] for r in insert_params[0].obj]
+
+    conn = FakeConnection()
+    backtest_rows = [{"slate_date": "2026-01-10", "strategy": "s1"}, {"strategy": "s2"}]
+    upsert_backtest_rows(conn, "backtest_top3_daily", backtest_rows)
+    deletes = [params for sql, params in conn.executed if sql.startswith("DELETE")]
+    assert [(day, len(keys)) for day, keys in deletes] == [(date(2026, 1, 10), 1)]
+
+    conn = FakeConnection()
+    assert upsert_prediction_rows(conn, date(2026, 1, 10), []) == 0
+    assert conn.executed == []
+
+
+def test_first_float_takes_first_parseable_value() -> None:
+    keys = ("projected_ppg", "projection_ppg", "projected_points")
+    rows = [
+        {"projected_ppg": 0, "projection_ppg": 9, "projected_points": 8},
+        {"projected_ppg": None, "projection_ppg": 7, "projected_points": 6},
+        {"projected_ppg": "", "projection_ppg": "3", "projected_points": 2},
+        {"projected_ppg": "n/a", "projection_ppg": "4", "projected_points": 5},
+        {"projected_ppg": "12.5", "projection_ppg": 1, "projected_points": 0},
+        {"projected_ppg": None, "projected_points": "abc"},
+    ]
+    # Zero is a real value; None, "" and non-numeric strings fall through.
+    assert [_first_float(row, *keys) for row in rows] == [0.0, 7.0, 3.0, 4.0, 12.5, None]
+
+
+def test_store_raw_snapshot_skips_only_when_latest_snapshot_matches() -> None:
+    conn = FakeConnection()
+    day = date(2026, 1, 10)
+    payload_a = [{"player_name": "A", "projected_ppg": 20}]
+    payload_b = [{"player_name": "A", "projected_ppg": 22}]
+    assert store_raw_snapshot(conn, "/predictions", day, payload_a) is True
+    assert store_raw_snapshot(conn, "/predictions", day, payload_a, encode_rows(payload_a)) is False
+    assert store_raw_snapshot(conn, "/predictions", day, payload_b) is True
+    # Reverting to an earlier payload is still a change against the latest one.
+    assert store_raw_snapshot(conn, "/predictions", day, payload_a) is True
+    assert store_raw_snapshot(conn, "/predictions", date(2026, 1, 11), payload_a) is True
+
+
+def test_store_raw_snapshot_dedupes_undated_payloads() -> None:
+    conn = FakeConnection()
+    payload = {"data": [{"game_date": "2026-01-10", "mae": 4.2}]}
+    assert store_raw_snapshot(conn, "/accuracy/daily-summary", None, payload) is True
+    assert store_raw_snapshot(conn, "/accuracy/daily-summary", None, payload) is False
+    assert "snapshot_date IS NULL" in conn.executed[-1][0]
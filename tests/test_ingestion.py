@@ -0,0 +1,82 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from nba_analytics.api_client import NbaDailyApiClient, PaginationLimitError
+from nba_analytics.ingestion import PREDICTION_RANGE_DAYS, fetch_predictions_by_date
+
+
+class PredictionsStub(NbaDailyApiClient):
+    def __init__(self, range_rows: list[dict] | None) -> None:
+        super().__init__(base_url="http://example")
+        self.range_rows = range_rows
+        self.requests: list[dict] = []
+
+    def paginated_records(self, path, params=None, page_size=500, max_pages=500, max_concurrency=8):
+        self.requests.append(params)
+        if "date" in params:
+            return [{"game_date": params["date"], "player_name": "per-date"}]
+        if self.range_rows is None:
+            raise PaginationLimitError("GET /predictions has more than max_pages=500 pages")
+        return self.range_rows
+
+
+DATES = [date(2026, 1, 9), date(2026, 1, 10), date(2026, 1, 11)]
+
+
+def test_fetch_predictions_by_date_groups_range_rows() -> None:
+    client = PredictionsStub(
+        [
+            {"game_date": "2026-01-09", "player_name": "A"},
+            {"date": "2026-01-11T19:30:00", "player_name": "B"},
+            {"game_date": "2026-01-09", "player_name": "C"},
+        ]
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        grouped = fetch_predictions_by_date(client, DATES, 100, executor)
+    assert {d: [row["player_name"] for row in rows] for d, rows in grouped.items()} == {
+        date(2026, 1, 9): ["A", "C"],
+        date(2026, 1, 10): [],
+        date(2026, 1, 11): ["B"],
+    }
+    assert client.requests == [{"start_date": "2026-01-09", "end_date": "2026-01-11"}]
+
+
+def test_fetch_predictions_by_date_falls_back_per_date(caplog) -> None:
+    client = PredictionsStub([{"game_date": "2026-01-09", "player_name": "A"}, {"player_name": "undated"}])
+    caplog.set_level(logging.WARNING, logger="nba_analytics.ingestion")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        grouped = fetch_predictions_by_date(client, DATES, 100, executor)
+    assert list(grouped) == DATES
+    assert all(rows == [{"game_date": d.isoformat(), "player_name": "per-date"}] for d, rows in grouped.items())
+    assert sorted(params["date"] for params in client.requests[1:]) == [d.isoformat() for d in DATES]
+    assert "refetching 3 dates" in caplog.text
+
+
+def test_fetch_predictions_by_date_without_dates_makes_no_request() -> None:
+    client = PredictionsStub([])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert fetch_predictions_by_date(client, [], 100, executor) == {}
+    assert client.requests == []
+
+
+def test_fetch_predictions_by_date_splits_long_windows() -> None:
+    dates = [date(2026, 1, 1) + timedelta(days=i) for i in range(PREDICTION_RANGE_DAYS * 2 + 2)]
+    client = PredictionsStub([])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        grouped = fetch_predictions_by_date(client, dates, 100, executor)
+    assert list(grouped) == dates
+    assert [(params["start_date"], params["end_date"]) for params in client.requests] == [
+        (dates[0].isoformat(), dates[PREDICTION_RANGE_DAYS - 1].isoformat()),
+        (dates[PREDICTION_RANGE_DAYS].isoformat(), dates[2 * PREDICTION_RANGE_DAYS - 1].isoformat()),
+        (dates[2 * PREDICTION_RANGE_DAYS].isoformat(), dates[-1].isoformat()),
+    ]
+
+
+def test_fetch_predictions_by_date_refetches_truncated_ranges(caplog) -> None:
+    caplog.set_level(logging.WARNING, logger="nba_analytics.ingestion")
+    client = PredictionsStub(None)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        grouped = fetch_predictions_by_date(client, DATES, 100, executor)
+    assert all(rows == [{"game_date": d.isoformat(), "player_name": "per-date"}] for d, rows in grouped.items())
+    assert "more than max_pages" in caplog.text
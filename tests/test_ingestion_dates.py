@@ -1,6 +1,9 @@
-from datetime import date
+import sys
+from datetime import date, timedelta
 
-from nba_analytics.ingestion import filter_dates
+import pytest
+
+from nba_analytics.ingestion import VECTORIZE_MIN_DATES, filter_dates
 
 
 def test_filter_dates_applies_start_and_end() -> None:
@@ -8,3 +11,34 @@ def test_filter_dates_applies_start_and_end() -> None:
     result = filter_dates(values, date(2026, 1, 5), date(2026, 1, 15), lookback_days=None)
     assert result == [date(2026, 1, 10)]
 
+
+def test_filter_dates_dedupes_and_handles_open_bounds() -> None:
+    values = ["2026-01-20", "2026-01-01T12:00:00", "", "2026-01-10", "2026-01-10"]
+    assert filter_dates(values, None, None, lookback_days=None) == [
+        date(2026, 1, 1),
+        date(2026, 1, 10),
+        date(2026, 1, 20),
+    ]
+    assert filter_dates(values, date(2026, 1, 10), None, lookback_days=None) == [date(2026, 1, 10), date(2026, 1, 20)]
+    assert filter_dates(values, None, date(2026, 1, 10), lookback_days=None) == [date(2026, 1, 1), date(2026, 1, 10)]
+
+
+def test_filter_dates_vectorized_path_matches_small_inputs() -> None:
+    base = date(2025, 10, 1)
+    values = [(base + timedelta(days=i % 150)).isoformat() for i in range(VECTORIZE_MIN_DATES * 3)]
+    values += ["", "2026-01-10T08:00:00"]
+    start, end = date(2025, 11, 1), date(2026, 1, 10)
+    expected = [d for d in sorted({date.fromisoformat(v[:10]) for v in values if v}) if start <= d <= end]
+    result = filter_dates(values, start, end, lookback_days=None)
+    assert result == expected
+    assert all(type(d) is date for d in result)
+    assert filter_dates(values, None, None, lookback_days=None)[0] == base
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="basic-format ISO dates need Python 3.11")
+@pytest.mark.parametrize("padding", [0, VECTORIZE_MIN_DATES])
+def test_filter_dates_normalises_basic_iso_format(padding: int) -> None:
+    values = ["20260105", "2026-01-03", "2026-01-07", "2026-W02-3"] + ["2025-06-01"] * padding
+    result = filter_dates(values, date(2026, 1, 4), date(2026, 1, 10), lookback_days=None)
+    assert result == [date(2026, 1, 5), date(2026, 1, 7)]
+    assert filter_dates(values, None, date(2026, 1, 5), lookback_days=None)[-2:] == [date(2026, 1, 3), date(2026, 1, 5)]
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from psycopg.postgres import types as pg_types
+
+from nba_analytics import queries
+from nba_analytics.queries import _df, _frame
+
+
+def _column(name: str, type_name: str) -> SimpleNamespace:
+    return SimpleNamespace(name=name, type_code=pg_types[type_name].oid)
+
+
+def test_frame_casts_float_columns_from_cursor_description() -> None:
+    description = [
+        _column("mae", "float4"),
+        _column("rmse", "float8"),
+        _column("hit_rate", "numeric"),
+        _column("team", "text"),
+    ]
+    rows = [(1.5, None, Decimal("0.25"), "BOS"), (None, None, None, "NYK")]
+    frame = _frame(rows, description)
+    assert list(frame.columns) == ["mae", "rmse", "hit_rate", "team"]
+    assert {name: str(dtype) for name, dtype in frame.dtypes.items()} == {
+        "mae": "float64",
+        "rmse": "float64",
+        "hit_rate": "float64",
+        "team": "object",
+    }
+    assert frame["hit_rate"].tolist()[0] == 0.25
+
+
+def test_frame_handles_empty_results() -> None:
+    frame = _frame([], [_column("mae", "float8")])
+    assert frame.empty
+    assert str(frame["mae"].dtype) == "float64"
+    assert _frame([], None).empty
+
+
+class FakeStreamCursor:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.fetches = 0
+        self.description = [_column("mae", "float8")]
+
+    def __enter__(self) -> "FakeStreamCursor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def execute(self, sql, params=()) -> None:
+        pass
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        self.fetches += 1
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+
+def test_df_stops_streaming_after_a_short_chunk(monkeypatch) -> None:
+    monkeypatch.setattr(queries, "STREAM_CHUNK_SIZE", 2)
+    cursor = FakeStreamCursor([(1.0,), (2.0,), (3.0,)])
+    conn = SimpleNamespace(cursor=lambda **kwargs: cursor)
+    frame = _df(conn, "SELECT mae FROM accuracy_daily")
+    assert frame["mae"].tolist() == [1.0, 2.0, 3.0]
+    assert cursor.fetches == 2